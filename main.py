@@ -14,6 +14,7 @@ def main():
     
     agent = OnlineLiteratureSearchAgent()
     json_results = agent.search_and_export_json(query)
+    agent.close()
     
     print("\n" + "="*50)
     print("SEARCH RESULTS")
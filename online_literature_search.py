@@ -1,12 +1,150 @@
+import asyncio
+import gzip
+import hashlib
 import json
+import os
+import queue
+import re
 import requests
+import shelve
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import argparse
-import ollama
-from pdf_downloader import PDFDownloader
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+from urllib3.util.retry import Retry
+from json_output import dumps_json
+
+# ollama, numpy and the PDF downloader are slow to import and not needed by every
+# run (e.g. --help, cached enhancements, no PDFs), so they load on first use
+if TYPE_CHECKING:
+    import numpy as np
+    import ollama
+    from pdf_downloader import PDFDownloader
+
+
+# Persistent cache limits (query enhancements and Semantic Scholar responses)
+CACHE_MAX_ENTRIES = 10_000
+SEARCH_CACHE_TTL = 24 * 60 * 60  # Search results go stale, enhancements do not
+_CACHE_ORDER_KEY = "__insertion_order__"
+
+# Semantic Scholar relevance search paging (offset + limit may not exceed 1000)
+SEMANTIC_SCHOLAR_FIELDS = "title,year,authors,journal,url,externalIds"
+SEMANTIC_SCHOLAR_PAGE_SIZE = 100
+SEMANTIC_SCHOLAR_MAX_RESULTS = 1000
+SEMANTIC_SCHOLAR_PARALLEL_PAGES = 3  # Concurrent page requests, kept low for rate limits
+SEMANTIC_SCHOLAR_RATE = (100, 5 * 60)  # Unauthenticated limit: 100 requests per 5 minutes
+
+# OpenAlex works search
+OPENALEX_BASE = "https://api.openalex.org"
+OPENALEX_PAGE_SIZE = 200
+OPENALEX_FIELDS = "id,doi,title,publication_year,authorships,primary_location"
+SOURCES = ("semantic_scholar", "openalex", "auto")
+
+# Result pages found but not yet picked up by the PDF downloader
+PDF_QUEUE_SIZE = 2
+
+# Queries that already read like academic search terms skip LLM enhancement
+ACADEMIC_KEYWORDS = frozenset({
+    "modeling", "modelling", "analysis", "surveillance", "epidemiology", "clinical",
+    "efficacy", "forecasting", "genomic", "cohort", "randomized", "meta-analysis",
+    "systematic review", "simulation", "algorithm", "inference", "regression",
+    "mechanism", "pathogenesis", "phylogenetic", "longitudinal", "prevalence"
+})
+MIN_ACADEMIC_QUERY_TOKENS = 4
+MAX_ENHANCEABLE_QUERY_LENGTH = 60
+
+# Query enhancement prompt and generation settings
+_ENHANCE_PROMPT = """Create a precise academic search query for scientific databases.
+
+Original query: "{query}"
+
+Generate a focused search query by:
+1. Keep main scientific concepts from the original
+2. Add 2-3 specific technical terms from peer-reviewed literature  
+3. Include research methodology keywords (modeling, analysis, epidemiology, surveillance)
+4. Use academic terminology found in paper titles/abstracts
+5. Avoid broad common words that match irrelevant content
+
+Examples:
+"west nile virus prediction" → "west nile virus epidemic modeling forecasting surveillance"
+"cancer treatment efficacy" → "cancer therapy treatment outcomes clinical efficacy"
+"climate modeling" → "climate modeling atmospheric simulation weather prediction"
+
+Return only the enhanced search query (under 80 characters):"""
+_ENHANCE_OPTIONS = {
+    "temperature": 0.1,  # Very low temperature for consistency
+    "num_predict": 40,   # An enhanced query is well under 40 tokens; longer output is rejected anyway
+    "stop": ["\n\n"],
+    "num_ctx": 1024      # The prompt is short; a small context shrinks the KV cache and speeds up prefill
+}
+
+# Thinking tags, stray angle brackets, or multiple paragraphs mean the LLM did not answer with a query
+_BAD_RESPONSE = re.compile(r"</?think>|[<>]|\n\n")
+
+# Semantic cache: reuse the enhancement of a paraphrased query
+EMBEDDING_MODEL = "nomic-embed-text"
+SEMANTIC_CACHE_THRESHOLD = 0.85  # Minimum cosine similarity for a hit
+
+
+def _open_out(path: str, mode: str = 'wb'):
+    """Open an output file in binary mode, gzip-compressed when the path ends in .gz"""
+    if path.endswith('.gz'):
+        # Level 3 gets most of the size reduction at a fraction of level 9's cost
+        return gzip.open(path, mode, compresslevel=3)
+    return open(path, mode)
+
+
+class _RateLimiter:
+    """Thread-safe limiter that spaces request starts evenly to stay under max_calls per period"""
+    
+    def __init__(self, max_calls: int, period: float):
+        self.interval = period / max_calls
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until the caller may send its request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _SeenPapers:
+    """
+    Tracks papers for deduplication by DOI, or by title when a copy has no DOI
+    
+    Distinct papers can share a generic title ("Editorial"), so a title match
+    only counts as a duplicate when the DOIs cannot tell the two apart.
+    """
+    
+    def __init__(self):
+        self._dois = set()
+        self._title_dois: Dict[str, set] = {}  # DOIs (None for missing) seen under each title
+    
+    def add(self, paper: Dict[str, Any]) -> bool:
+        """Record a paper, returning False if it duplicates one already recorded"""
+        doi = paper["doi"].lower() if paper["doi"] else None
+        title = paper["title"].lower().strip()  # Untitled papers are only matched by DOI
+        
+        if doi in self._dois:
+            return False
+        title_dois = self._title_dois.get(title) if title else None
+        if title_dois is not None and (doi is None or None in title_dois):
+            return False
+        
+        if doi:
+            self._dois.add(doi)
+        if title:
+            self._title_dois.setdefault(title, set()).add(doi)
+        return True
 
 
 @dataclass
@@ -22,29 +160,169 @@ class OnlineLiteratureResult:
 
 
 class OnlineLiteratureSearchAgent:
-    """Agent for searching online peer-reviewed literature using Semantic Scholar"""
+    """Agent for searching online peer-reviewed literature using Semantic Scholar and OpenAlex"""
     
-    def __init__(self):
+    def __init__(self, cache_path: str = "enhance_cache.db", embedding_cache_path: str = "enhance_embcache.npz"):
+        """
+        Initialize search agent
+        
+        Args:
+            cache_path: Disk cache for LLM query enhancements and search responses
+            embedding_cache_path: Query embeddings used to match paraphrased queries
+        """
         self.semantic_scholar_base = "https://api.semanticscholar.org/graph/v1"
         self.llm_model = "qwen3:latest"
+        
+        # Retry rate limits and transient server errors with jittered exponential backoff
+        retry = Retry(
+            total=5,
+            backoff_factor=1.5,
+            backoff_jitter=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        # One pooled session for every API call, so back-to-back requests
+        # (result pages, OpenAlex, repeated searches) reuse TCP/TLS connections
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": "research-paper-search-agent/0.1.0"})
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+        self._semantic_scholar_limiter = _RateLimiter(*SEMANTIC_SCHOLAR_RATE)
+        self._cache = shelve.open(cache_path)
+        self._cache_order = self._cache.get(_CACHE_ORDER_KEY, [])
+        
+        # Unit-normalized query embeddings (one row each) and their enhancements
+        self._embedding_cache_path = embedding_cache_path
+        self._embeddings = None
+        self._embedding_enhancements: List[str] = []
+        self._load_embedding_cache()
     
-    def _save_incremental_results(self, results: List[Dict[str, Any]], output_file: str):
-        """Save incremental results to prevent data loss"""
-        search_info = {
-            "search_query": "Incremental save",
-            "years_back": 0,
-            "search_period": "ongoing",
-            "api_source": "semantic_scholar",
-            "total_results": len(results),
-            "search_date": datetime.now().isoformat(),
-            "papers": results
-        }
+    def close(self):
+        """Flush and close the on-disk cache and the HTTP session"""
+        self._cache.close()
+        self._session.close()
+    
+    @staticmethod
+    def _cache_key(*parts: Any) -> str:
+        """Build a stable cache key from the values that determine a result"""
+        return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    
+    def _cache_put(self, key: str, value: Any):
+        """Store a value, evicting the oldest entries beyond CACHE_MAX_ENTRIES"""
+        if key not in self._cache:
+            self._cache_order.append(key)
+        self._cache[key] = value
+        
+        while len(self._cache_order) > CACHE_MAX_ENTRIES:
+            self._cache.pop(self._cache_order.pop(0), None)
         
-        json_output = json.dumps(search_info, indent=2, ensure_ascii=False)
+        self._cache[_CACHE_ORDER_KEY] = self._cache_order
+        self._cache.sync()
+    
+    def _load_embedding_cache(self):
+        """Load the semantic cache written by a previous run, if any"""
+        if not os.path.exists(self._embedding_cache_path):
+            return
+        import numpy as np
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(json_output)
+        try:
+            with np.load(self._embedding_cache_path) as data:
+                if str(data["model"]) != EMBEDDING_MODEL:
+                    return  # Vectors from another model are not comparable
+                self._embeddings = data["embeddings"]
+                self._embedding_enhancements = data["enhancements"].tolist()
+        except Exception as e:
+            print(f"Ignoring unreadable embedding cache: {e}")
+    
+    def _save_embedding_cache(self):
+        """Persist the semantic cache"""
+        if self._embeddings is None:
+            return
+        import numpy as np
         
+        with open(self._embedding_cache_path, 'wb') as f:
+            np.savez(
+                f,
+                model=np.array(EMBEDDING_MODEL),
+                embeddings=self._embeddings,
+                enhancements=np.array(self._embedding_enhancements)
+            )
+    
+    async def _embed_queries(self, client: "ollama.AsyncClient", queries: List[str]) -> List[Optional["np.ndarray"]]:
+        """
+        Embed queries as unit vectors in a single request
+        
+        Returns None for every query if the embedding model is unavailable.
+        """
+        if not queries:
+            return []
+        try:
+            response = await client.embed(model=EMBEDDING_MODEL, input=queries)
+        except Exception as e:
+            print(f"Semantic cache unavailable ({EMBEDDING_MODEL}): {e}")
+            return [None] * len(queries)
+        import numpy as np
+        
+        embeddings = np.asarray(response['embeddings'], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1)
+        return [embedding / norm if norm else None for embedding, norm in zip(embeddings, norms)]
+    
+    def _semantic_cache_lookup(self, embedding: "np.ndarray") -> Optional[str]:
+        """Return the enhancement of the most similar cached query above the threshold"""
+        if self._embeddings is None or self._embeddings.shape[1] != embedding.shape[0]:
+            return None
+        import numpy as np
+        
+        # Rows are unit vectors, so one matmul gives every cosine similarity
+        similarities = self._embeddings @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return self._embedding_enhancements[best]
+        return None
+    
+    def _semantic_cache_add(self, embedding: "np.ndarray", enhanced: str):
+        """Remember the enhancement for a newly embedded query"""
+        import numpy as np
+        
+        if self._embeddings is None or self._embeddings.shape[1] != embedding.shape[0]:
+            self._embeddings = embedding[np.newaxis, :]
+            self._embedding_enhancements = [enhanced]
+        else:
+            self._embeddings = np.vstack([self._embeddings, embedding])
+            self._embedding_enhancements.append(enhanced)
+        
+        # Same bound as the exact-match cache, dropping the oldest rows
+        if len(self._embedding_enhancements) > CACHE_MAX_ENTRIES:
+            self._embeddings = self._embeddings[-CACHE_MAX_ENTRIES:]
+            self._embedding_enhancements = self._embedding_enhancements[-CACHE_MAX_ENTRIES:]
+    
+    @staticmethod
+    def _progress_file(output_file: str) -> str:
+        """Path of the NDJSON file that holds incremental saves for output_file"""
+        if output_file.endswith(".gz"):
+            return output_file.removesuffix(".gz") + ".ndjson.gz"
+        return output_file + ".ndjson"
+    
+    def _start_incremental_results(self, output_file: str):
+        """Discard progress left over from an earlier search into the same file"""
+        self._last_saved_idx = 0
+        progress_file = self._progress_file(output_file)
+        if os.path.exists(progress_file):
+            os.remove(progress_file)
+    
+    def _save_incremental_results(self, results: List[Dict[str, Any]], output_file: str):
+        """Save incremental results to prevent data loss
+        
+        Only papers found since the previous save are appended, one JSON object
+        per line, so each save costs the size of the new papers rather than
+        rewriting everything found so far.
+        """
+        # Appending to a .gz file adds a gzip member; readers decompress them as one stream
+        with _open_out(self._progress_file(output_file), 'ab') as f:
+            for paper in results[self._last_saved_idx:]:
+                f.write(dumps_json(paper) + b"\n")
+        
+        self._last_saved_idx = len(results)
+    
     def search_literature(
         self, 
         query: str, 
@@ -53,89 +331,233 @@ class OnlineLiteratureSearchAgent:
         output_file: Optional[str] = None,
         start_year: Optional[int] = None,
         end_year: Optional[int] = None,
-        journals: Optional[List[str]] = None
+        journals: Optional[List[str]] = None,
+        source: str = "semantic_scholar",
+        on_papers: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        include_abstract: bool = False
     ) -> List[Dict[str, Any]]:
         """
-        Search for peer-reviewed literature using Semantic Scholar
+        Search for peer-reviewed literature using Semantic Scholar and/or OpenAlex
         
         Args:
             query: Search query/context
             years_back: How many years back to search (default: 10)
-            max_results: Maximum number of results (up to 100 without API key)
-            output_file: Output file for incremental saves
+            max_results: Maximum number of results (up to 1000, fetched 100 per request)
+            output_file: Output file; incremental saves are appended to <output_file>.ndjson
             start_year: Specific start year (overrides years_back)
             end_year: Specific end year (overrides years_back)
             journals: List of journal names to filter by (optional)
+            source: "semantic_scholar", "openalex", or "auto" (query both in parallel and merge)
+            on_papers: Called with each batch of papers as soon as it is parsed (optional)
+            include_abstract: Request abstracts, the bulk of each response (default: False)
             
         Returns:
             List of dictionaries with publication metadata
         """
-        # Use specific years if provided, otherwise calculate from years_back
-        if start_year is not None and end_year is not None:
-            search_start = start_year
-            search_end = end_year
-        else:
-            current_year = datetime.now().year
-            search_start = current_year - years_back
-            search_end = current_year
+        search_start, search_end = self._resolve_range(years_back, start_year, end_year)
         
         print(f"Searching for papers from {search_start} to {search_end}...")
         
         # Use qwen3 to enhance the search query
         enhanced_query = self._enhance_query_with_llm(query)
         
-        return self._search_semantic_scholar(enhanced_query, search_start, search_end, max_results, output_file, journals)
+        if source == "openalex":
+            return self._search_openalex(
+                enhanced_query, search_start, search_end, max_results, journals, on_papers, include_abstract
+            )
+        if source == "auto":
+            return self._search_all_sources(
+                enhanced_query, search_start, search_end, max_results, output_file, journals, on_papers, include_abstract
+            )
+        return self._search_semantic_scholar(
+            enhanced_query, search_start, search_end, max_results, output_file, journals, on_papers, include_abstract
+        )
+    
+    @staticmethod
+    def _resolve_range(years_back: int, start_year: Optional[int], end_year: Optional[int]) -> tuple[int, int]:
+        """Use specific years if provided, otherwise calculate (start, end) from years_back"""
+        if start_year is not None and end_year is not None:
+            return start_year, end_year
+        current_year = datetime.now().year
+        return current_year - years_back, current_year
+    
+    def enhance_queries(self, queries: List[str]) -> List[str]:
+        """
+        Enhance several search queries with qwen3 in one concurrent batch
+        
+        Args:
+            queries: Search queries to enhance
+            
+        Returns:
+            Enhanced queries in the same order (originals where enhancement failed)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._enhance_queries_with_llm(queries))
+        
+        # asyncio.run cannot nest inside a running loop (e.g. a Jupyter cell), and the
+        # shelve cache cannot move to another thread, so block on this one instead
+        return self._enhance_queries_blocking(queries)
     
     def _enhance_query_with_llm(self, query: str) -> str:
         """Use qwen3 to enhance the search query for better academic search results"""
         try:
-            prompt = f"""Create a precise academic search query for scientific databases.
-
-Original query: "{query}"
-
-Generate a focused search query by:
-1. Keep main scientific concepts from the original
-2. Add 2-3 specific technical terms from peer-reviewed literature  
-3. Include research methodology keywords (modeling, analysis, epidemiology, surveillance)
-4. Use academic terminology found in paper titles/abstracts
-5. Avoid broad common words that match irrelevant content
-
-Examples:
-"west nile virus prediction" → "west nile virus epidemic modeling forecasting surveillance"
-"cancer treatment efficacy" → "cancer therapy treatment outcomes clinical efficacy"
-"climate modeling" → "climate modeling atmospheric simulation weather prediction"
-
-Return only the enhanced search query (under 80 characters):"""
+            return self.enhance_queries([query])[0]
+        except Exception as e:
+            print(f"Error enhancing query with LLM: {e}")
+            return query
+    
+    async def _enhance_queries_with_llm(self, queries: List[str]) -> List[str]:
+        """
+        Enhance a batch of queries concurrently through the async Ollama client
+        
+        At most OLLAMA_NUM_PARALLEL (default: 4) requests are in flight at once.
+        Set the same variable on the Ollama server, otherwise it queues them.
+        """
+        enhanced_by_query, pending = self._cached_enhancements(queries)
+        if not pending:
+            return [enhanced_by_query[query] for query in queries]
+        
+        import ollama
+        
+        client = ollama.AsyncClient()
+        semaphore = asyncio.Semaphore(int(os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+        
+        # One embedding request covers every remaining query
+        embeddings = await self._embed_queries(client, list(pending))
+        
+        async def enhance(query: str, key: str, embedding: Optional["np.ndarray"]) -> str:
+            async with semaphore:
+                if embedding is not None:
+                    similar = self._semantic_cache_lookup(embedding)
+                    if similar is not None:
+                        print(f"Using cached enhancement of a similar query for: {query}")
+                        self._cache_put(key, similar)
+                        return similar
+                
+                enhanced = await self._enhance_single_query(client, query, key)
+                if embedding is not None and enhanced != query:
+                    self._semantic_cache_add(embedding, enhanced)
+                return enhanced
+        
+        enhanced = await asyncio.gather(
+            *(enhance(query, key, embedding) for (query, key), embedding in zip(pending.items(), embeddings))
+        )
+        enhanced_by_query.update(zip(pending, enhanced))
+        self._save_embedding_cache()
+        return [enhanced_by_query[query] for query in queries]
+    
+    def _enhance_queries_blocking(self, queries: List[str]) -> List[str]:
+        """
+        Enhance queries one at a time through the synchronous Ollama client
+        
+        Used inside a running event loop; the semantic cache is skipped here.
+        """
+        enhanced_by_query, pending = self._cached_enhancements(queries)
+        if pending:
+            import ollama
             
-            response = ollama.generate(
+            client = ollama.Client()
+            for query, key in pending.items():
+                try:
+                    response = client.generate(
+                        model=self.llm_model,
+                        prompt=_ENHANCE_PROMPT.format(query=query),
+                        options=_ENHANCE_OPTIONS,
+                        think=False
+                    )
+                except Exception as e:
+                    print(f"Error enhancing query with LLM: {e}")
+                    enhanced_by_query[query] = query
+                    continue
+                enhanced_by_query[query] = self._accept_enhancement(query, response['response'], key)
+        return [enhanced_by_query[query] for query in queries]
+    
+    def _cached_enhancements(self, queries: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Answer what the skip rules and the exact-match cache can before calling Ollama
+        
+        Returns:
+            The answered queries mapped to their enhancements, and the remaining
+            queries mapped to their cache keys
+        """
+        enhanced_by_query = {}
+        pending = {}
+        for query in dict.fromkeys(queries):
+            skip_reason = self._skip_enhancement_reason(query)
+            if skip_reason:
+                print(f"Skipping LLM enhancement ({skip_reason}): {query}")
+                enhanced_by_query[query] = query
+                continue
+            
+            key = self._cache_key(self.llm_model, _ENHANCE_PROMPT, _ENHANCE_OPTIONS, query)
+            if key in self._cache:
+                print(f"Using cached enhancement for: {query}")
+                enhanced_by_query[query] = self._cache[key]
+            else:
+                pending[query] = key
+        return enhanced_by_query, pending
+    
+    @staticmethod
+    def _skip_enhancement_reason(query: str) -> Optional[str]:
+        """Explain why a query needs no LLM enhancement, or None if it should be enhanced"""
+        if len(query) > MAX_ENHANCEABLE_QUERY_LENGTH:
+            return "query is already long"
+        
+        lowered = query.lower()
+        if len(query.split()) >= MIN_ACADEMIC_QUERY_TOKENS and any(keyword in lowered for keyword in ACADEMIC_KEYWORDS):
+            return "query already uses academic terminology"
+        
+        return None
+    
+    async def _enhance_single_query(self, client: "ollama.AsyncClient", query: str, cache_key: str) -> str:
+        """Ask qwen3 for an enhanced version of one query, falling back to the original"""
+        try:
+            response = await client.generate(
                 model=self.llm_model,
-                prompt=prompt,
-                options={"temperature": 0.1}  # Very low temperature for consistency
+                prompt=_ENHANCE_PROMPT.format(query=query),
+                options=_ENHANCE_OPTIONS,
+                think=False  # qwen3 would otherwise spend num_predict on its reasoning
             )
-            
-            enhanced = response['response'].strip().strip('"').strip("'")
-            
-            # Clean up any thinking tags or extra text
-            if '<think>' in enhanced or '</think>' in enhanced:
-                print("LLM returned thinking process, using original query")
-                return query
-            
-            # If response is too long or contains unusual characters, use original
-            if len(enhanced) > 100 or any(char in enhanced for char in ['<', '>', '\n\n']):
-                print("LLM response too long or malformed, using original query")
-                return query
-            
-            # If enhanced query is significantly different or empty, use original
-            if not enhanced or len(enhanced) < len(query):
-                print("LLM response invalid, using original query")
-                return query
-            
-            print(f"Enhanced query: {enhanced}")
-            return enhanced
-            
         except Exception as e:
+            # Not cached, so the next run retries once Ollama is reachable
             print(f"Error enhancing query with LLM: {e}")
             return query
+        
+        return self._accept_enhancement(query, response['response'], cache_key)
+    
+    def _accept_enhancement(self, query: str, response_text: str, cache_key: str) -> str:
+        """Clean an LLM answer and cache it, returning the original query if it is unusable"""
+        enhanced = self._clean_llm_response(query, response_text)
+        if enhanced != query:
+            # A rejected answer falls back to this query's own text, which must not be
+            # served for other queries (or pinned for this one) by the caches
+            self._cache_put(cache_key, enhanced)
+        return enhanced
+    
+    def _clean_llm_response(self, query: str, response_text: str) -> str:
+        """Validate the raw LLM output, returning the original query if it is unusable"""
+        enhanced = response_text.strip().strip('"').strip("'")
+        
+        # One scan covers thinking tags and the other malformed-output markers
+        bad = _BAD_RESPONSE.search(enhanced)
+        if bad and "think" in bad.group():
+            print("LLM returned thinking process, using original query")
+            return query
+        
+        # If response is too long or contains unusual characters, use original
+        if len(enhanced) > 100 or bad:
+            print("LLM response too long or malformed, using original query")
+            return query
+        
+        # If enhanced query is significantly different or empty, use original
+        if not enhanced or len(enhanced) < len(query):
+            print("LLM response invalid, using original query")
+            return query
+        
+        print(f"Enhanced query: {enhanced}")
+        return enhanced
     
     def _search_semantic_scholar(
         self, 
@@ -144,85 +566,391 @@ Return only the enhanced search query (under 80 characters):"""
         end_year: int, 
         max_results: int,
         output_file: Optional[str] = None,
-        journals: Optional[List[str]] = None
+        journals: Optional[List[str]] = None,
+        on_papers: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        include_abstract: bool = False
     ) -> List[Dict[str, Any]]:
         """Search using Semantic Scholar API"""
         
         params = {
             "query": query,
             "year": f"{start_year}:{end_year}",
-            "limit": min(max_results, 100),  # API limit without key
-            "fields": "title,year,authors,journal,abstract,url"
+            "fields": SEMANTIC_SCHOLAR_FIELDS + (",abstract" if include_abstract else "")
         }
+        max_results = min(max_results, SEMANTIC_SCHOLAR_MAX_RESULTS)
         
+        # Pages already handed to on_papers are kept even if a later page fails
+        results = []
         try:
             print(f"Searching Semantic Scholar database...")
-            print(f"Note: Using free access - up to {min(max_results, 100)} papers per search")
+            print(f"Note: Using free access - up to {max_results} papers, "
+                  f"{SEMANTIC_SCHOLAR_PAGE_SIZE} per request")
+            if output_file:
+                self._start_incremental_results(output_file)
             
-            response = requests.get(f"{self.semantic_scholar_base}/paper/search", 
-                                    params=params, timeout=30)
-            response.raise_for_status()
+            # Parse each page as it arrives so on_papers consumers can start early;
+            # the bar advances once per page rather than printing per paper
+            seen = _SeenPapers()
+            examined = 0
+            with tqdm(total=max_results, desc="Semantic Scholar", unit="paper") as progress:
+                for page_papers in self._fetch_semantic_scholar_pages(params, max_results):
+                    # Relevance ranking can shift between page requests and repeat a paper
+                    page_results = []
+                    for paper in self._process_semantic_scholar_papers(page_papers, journals):
+                        if seen.add(paper):
+                            page_results.append(paper)
+                    results.extend(page_results)
+                    examined += len(page_papers)
+                    progress.update(len(page_papers))
+                    if output_file and page_results:
+                        # Saved before the downloader sees them; saves only append the new page
+                        self._save_incremental_results(results, output_file)
+                    if on_papers and page_results:
+                        on_papers(page_results)
+                
+                if examined < max_results:
+                    progress.total = examined  # Fewer papers matched than requested
+                    progress.refresh()
+            
+            print(f"Processed {len(results)} papers (examined {examined})")
+            if output_file:
+                print(f"✓ Saved {len(results)} papers to file")
+            
+            print(f"Found {len(results)} papers from Semantic Scholar")
+            return results
+            
+        except requests.RequestException as e:
+            print(f"Error querying Semantic Scholar: {e}")
+        except Exception as e:
+            print(f"Error processing Semantic Scholar response: {e}")
+        
+        if results:
+            print(f"Keeping the {len(results)} papers found before the error")
+        return results
+    
+    def _process_semantic_scholar_papers(
+        self,
+        papers: List[Dict[str, Any]],
+        journals: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Normalize raw Semantic Scholar papers and apply the journal filter"""
+        # Plain dict access per paper; a malformed response fails the whole search
+        results = [
+            {
+                "publish_year": str(paper.get("year") or ""),
+                "title": paper.get("title") or "",
+                "journal": (paper.get("journal") or {}).get("name") or "",
+                "doi": (paper.get("externalIds") or {}).get("DOI"),
+                "authors": [author.get("name") or "" for author in paper.get("authors") or []],
+                "abstract": paper.get("abstract"),
+                "url": paper.get("url")
+            }
+            for paper in papers
+        ]
+        
+        # Filter by journals if specified
+        if journals:
+            results = [result for result in results if self._journal_matches(result["journal"], journals)]
+        
+        return results
+    
+    def _fetch_semantic_scholar_pages(self, params: Dict[str, Any], max_results: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the raw papers of each page in order, requesting the pages after the first concurrently
+        
+        The first page reports how many papers match, so only pages that can
+        contain results are requested. Pages are cached individually.
+        """
+        page_limits = {
+            offset: min(SEMANTIC_SCHOLAR_PAGE_SIZE, max_results - offset)
+            for offset in range(0, max_results, SEMANTIC_SCHOLAR_PAGE_SIZE)
+        }
+        first_page = self._get_semantic_scholar_page(params, 0, page_limits.pop(0))
+        yield first_page.get("data", [])
+        
+        available = first_page.get("total", len(first_page.get("data", [])))
+        page_limits = {offset: limit for offset, limit in page_limits.items() if offset < available}
+        if not page_limits:
+            return
+        
+        with ThreadPoolExecutor(max_workers=SEMANTIC_SCHOLAR_PARALLEL_PAGES) as executor:
+            # Cache lookups and writes stay on this thread; the shelve handle is not thread-safe
+            pages = {}
+            for offset, limit in page_limits.items():
+                page = self._cached_response(self._semantic_scholar_page_key(params, offset, limit))
+                if page is None:
+                    page = executor.submit(self._request_semantic_scholar_page, params, offset, limit)
+                pages[offset] = page
+            
+            for offset, page in pages.items():
+                if isinstance(page, Future):
+                    page = page.result()
+                    self._cache_response(self._semantic_scholar_page_key(params, offset, page_limits[offset]), page)
+                yield page.get("data", [])
+    
+    def _semantic_scholar_page_key(self, params: Dict[str, Any], offset: int, limit: int) -> str:
+        """Cache key of one search results page"""
+        return self._cache_key("semantic_scholar", params["query"], params["year"], params["fields"], offset, limit)
+    
+    def _cached_response(self, key: str) -> Optional[Any]:
+        """Return a cached search response if it has not expired"""
+        cached = self._cache.get(key)
+        if cached and time.time() - cached[0] < SEARCH_CACHE_TTL:
+            return cached[1]
+        return None
+    
+    def _cache_response(self, key: str, response: Any):
+        """Cache a search response with its fetch time"""
+        self._cache_put(key, (time.time(), response))
+    
+    def _get_semantic_scholar_page(self, params: Dict[str, Any], offset: int, limit: int) -> Dict[str, Any]:
+        """Return one search results page from the cache or the API"""
+        key = self._semantic_scholar_page_key(params, offset, limit)
+        page = self._cached_response(key)
+        if page is not None:
+            print("Using cached Semantic Scholar response")
+            return page
+        
+        page = self._request_semantic_scholar_page(params, offset, limit)
+        self._cache_response(key, page)
+        return page
+    
+    def _request_semantic_scholar_page(self, params: Dict[str, Any], offset: int, limit: int) -> Dict[str, Any]:
+        """Request one search results page from the API"""
+        self._semantic_scholar_limiter.wait()
+        response = self._session.get(f"{self.semantic_scholar_base}/paper/search",
+                                     params={**params, "offset": offset, "limit": limit}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+    
+    @staticmethod
+    def _journal_matches(journal: str, journals: Optional[List[str]]) -> bool:
+        """Check a paper's journal against the optional journal filter"""
+        if not journals:
+            return True
+        return any(target_journal.lower() in journal.lower() for target_journal in journals)
+    
+    def _search_all_sources(
+        self,
+        query: str,
+        start_year: int,
+        end_year: int,
+        max_results: int,
+        output_file: Optional[str] = None,
+        journals: Optional[List[str]] = None,
+        on_papers: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        include_abstract: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Search Semantic Scholar and OpenAlex in parallel and merge up to max_results papers, deduplicating by DOI or title"""
+        key = self._openalex_key(query, start_year, end_year, max_results, include_abstract)
+        works = self._cached_response(key)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Only the network call runs on the worker; the cache stays on this thread
+            openalex_future = None
+            if works is None:
+                openalex_future = executor.submit(
+                    self._request_openalex_works, query, start_year, end_year, max_results, include_abstract
+                )
             
-            data = response.json()
-            papers = data.get("data", [])
+            results = self._search_semantic_scholar(
+                query, start_year, end_year, max_results, output_file, journals, on_papers, include_abstract
+            )
             
-            results = []
-            for i, paper in enumerate(papers):
+            if openalex_future is not None:
                 try:
-                    # Extract authors
-                    authors = []
-                    if paper.get("authors"):
-                        authors = [author.get("name", "") for author in paper["authors"]]
-                    
-                    # Extract journal name
-                    journal = ""
-                    if paper.get("journal"):
-                        journal = paper["journal"].get("name", "")
-                    
-                    # Filter by journals if specified
-                    if journals:
-                        journal_match = False
-                        for target_journal in journals:
-                            if target_journal.lower() in journal.lower():
-                                journal_match = True
-                                break
-                        if not journal_match:
-                            continue  # Skip this paper
-                    
-                    result = {
-                        "publish_year": str(paper.get("year", "")),
-                        "title": paper.get("title", ""),
-                        "journal": journal,
-                        "doi": None,  # DOI not available from Semantic Scholar API
-                        "authors": authors,
-                        "abstract": paper.get("abstract"),
-                        "url": paper.get("url")
-                    }
-                    
-                    results.append(result)
-                    
-                    # Show progress every paper
-                    print(f"Processed {len(results)} papers (examined {i+1}/{len(papers)})")
-                    
-                    # Save incrementally every 5 papers
-                    if output_file and len(results) % 5 == 0:
-                        self._save_incremental_results(results, output_file)
-                        print(f"✓ Saved {len(results)} papers to file")
-                        
+                    works = openalex_future.result()
+                    self._cache_response(key, works)
                 except Exception as e:
-                    print(f"✗ Error processing paper {i+1}: {e}, skipping...")
-                    continue
+                    print(f"Error querying OpenAlex: {e}")
+                    works = []
+        
+        merged = []
+        seen = _SeenPapers()
+        semantic_scholar_count = None
+        for paper in results + [None] + self._process_openalex_works(works, journals):
+            if paper is None:
+                semantic_scholar_count = len(merged)  # Those were already passed to on_papers
+                continue
+            if len(merged) >= max_results:
+                break  # OpenAlex only fills what Semantic Scholar left of max_results
+            if seen.add(paper):
+                merged.append(paper)
+        
+        if on_papers and len(merged) > semantic_scholar_count:
+            on_papers(merged[semantic_scholar_count:])
+        
+        print(f"Found {len(merged)} unique papers across Semantic Scholar and OpenAlex")
+        return merged
+    
+    def _search_openalex(
+        self,
+        query: str,
+        start_year: int,
+        end_year: int,
+        max_results: int,
+        journals: Optional[List[str]] = None,
+        on_papers: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        include_abstract: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Search using OpenAlex API"""
+        try:
+            print(f"Searching OpenAlex database...")
             
-            print(f"Found {len(results)} papers from Semantic Scholar")
+            key = self._openalex_key(query, start_year, end_year, max_results, include_abstract)
+            works = self._cached_response(key)
+            if works is not None:
+                print("Using cached OpenAlex response")
+            else:
+                works = self._request_openalex_works(query, start_year, end_year, max_results, include_abstract)
+                self._cache_response(key, works)
+            
+            results = self._process_openalex_works(works, journals)
+            if on_papers and results:
+                on_papers(results)
+            print(f"Found {len(results)} papers from OpenAlex")
             return results
             
         except requests.RequestException as e:
-            print(f"Error querying Semantic Scholar: {e}")
+            print(f"Error querying OpenAlex: {e}")
             return []
         except Exception as e:
-            print(f"Error processing Semantic Scholar response: {e}")
+            print(f"Error processing OpenAlex response: {e}")
             return []
     
+    @staticmethod
+    def _openalex_fields(include_abstract: bool) -> str:
+        """Fields to select from OpenAlex works"""
+        return OPENALEX_FIELDS + (",abstract_inverted_index" if include_abstract else "")
+    
+    def _openalex_key(self, query: str, start_year: int, end_year: int, max_results: int, include_abstract: bool = False) -> str:
+        """Cache key of an OpenAlex works search"""
+        return self._cache_key("openalex", query, start_year, end_year, max_results, self._openalex_fields(include_abstract))
+    
+    def _request_openalex_works(
+        self,
+        query: str,
+        start_year: int,
+        end_year: int,
+        max_results: int,
+        include_abstract: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Request up to max_results raw works from the OpenAlex API"""
+        works = []
+        page = 1
+        # OpenAlex offsets page N by (N - 1) * per-page, so the page size must
+        # stay the same on every request; the surplus is trimmed below
+        per_page = min(OPENALEX_PAGE_SIZE, max_results)
+        while len(works) < max_results:
+            params = {
+                "search": query,
+                "filter": f"from_publication_date:{start_year}-01-01,to_publication_date:{end_year}-12-31",
+                "per-page": per_page,
+                "page": page,
+                "select": self._openalex_fields(include_abstract)
+            }
+            response = self._session.get(f"{OPENALEX_BASE}/works", params=params, timeout=30)
+            response.raise_for_status()
+            
+            page_works = response.json().get("results", [])
+            works.extend(page_works)
+            if len(page_works) < per_page:
+                break  # Last page
+            page += 1
+        
+        return works[:max_results]
+    
+    def _process_openalex_works(self, works: List[Dict[str, Any]], journals: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Normalize OpenAlex works into the same shape as Semantic Scholar results"""
+        results = []
+        for i, work in enumerate(works):
+            try:
+                location = work.get("primary_location") or {}
+                journal = (location.get("source") or {}).get("display_name") or ""
+                if not self._journal_matches(journal, journals):
+                    continue
+                
+                doi = work.get("doi")
+                if doi:
+                    doi = doi.removeprefix("https://doi.org/")
+                
+                results.append({
+                    "publish_year": str(work.get("publication_year") or ""),
+                    "title": work.get("title") or "",
+                    "journal": journal,
+                    "doi": doi,
+                    "authors": [
+                        (authorship.get("author") or {}).get("display_name") or ""
+                        for authorship in work.get("authorships") or []
+                    ],
+                    "abstract": self._openalex_abstract(work.get("abstract_inverted_index")),
+                    "url": location.get("landing_page_url") or work.get("id")
+                })
+            except Exception as e:
+                print(f"✗ Error processing OpenAlex work {i+1}: {e}, skipping...")
+                continue
+        
+        return results
+    
+    @staticmethod
+    def _openalex_abstract(inverted_index: Optional[Dict[str, List[int]]]) -> Optional[str]:
+        """Rebuild abstract text from OpenAlex's word -> positions index"""
+        if not inverted_index:
+            return None
+        positions = sorted(
+            (position, word)
+            for word, word_positions in inverted_index.items()
+            for position in word_positions
+        )
+        return " ".join(word for _, word in positions)
+    
+    def _search_while_downloading(
+        self,
+        downloader: "PDFDownloader",
+        query: str,
+        years_back: int,
+        max_results: int,
+        output_file: Optional[str],
+        start_year: Optional[int],
+        end_year: Optional[int],
+        journals: Optional[List[str]],
+        source: str,
+        include_abstract: bool,
+        pdf_results_file: Optional[str] = None
+    ) -> tuple[List[Dict[str, Any]], Dict]:
+        """
+        Run the search while the downloader consumes result pages from a bounded queue
+        
+        Downloads start as soon as the first page of results is parsed, so the
+        total time approaches the slower of searching and downloading rather
+        than their sum.
+        """
+        page_queue = queue.Queue(maxsize=PDF_QUEUE_SIZE)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            download_future = executor.submit(
+                downloader.download_paper_batches, iter(page_queue.get, None), results_file=pdf_results_file
+            )
+            
+            def enqueue(item: Optional[List[Dict[str, Any]]]):
+                # Stop feeding a downloader that died; its exception surfaces from result()
+                while not download_future.done():
+                    try:
+                        page_queue.put(item, timeout=1)
+                        return
+                    except queue.Full:
+                        continue
+            
+            try:
+                results = self.search_literature(
+                    query, years_back, max_results, output_file, start_year, end_year, journals, source,
+                    on_papers=enqueue, include_abstract=include_abstract
+                )
+            finally:
+                enqueue(None)  # Sentinel: the search is done
+            
+            return results, download_future.result()
+    
     def search_and_export_json(
         self, 
         query: str, 
@@ -234,7 +962,10 @@ Return only the enhanced search query (under 80 characters):"""
         download_pdfs: bool = False,
         pdf_mode: str = "open_access",
         pdf_dir: Optional[str] = None,
-        journals: Optional[List[str]] = None
+        journals: Optional[List[str]] = None,
+        source: str = "semantic_scholar",
+        include_abstract: bool = False,
+        pdf_workers: Optional[int] = None
     ) -> str:
         """
         Search literature and export results to JSON format
@@ -250,24 +981,59 @@ Return only the enhanced search query (under 80 characters):"""
             pdf_mode: "open_access" or "university_access"
             pdf_dir: Directory for PDF downloads
             journals: List of journal names to filter by (optional)
+            source: "semantic_scholar", "openalex", or "auto" (both, merged)
+            include_abstract: Include abstracts (always on when downloading PDFs)
+            pdf_workers: Number of PDFs downloaded concurrently (downloader default if None)
             
         Returns:
             JSON string with search results and metadata
         """
-        results = self.search_literature(query, years_back, max_results, output_file, start_year, end_year, journals)
+        # Abstracts dominate the response size, so they are only fetched when wanted
+        include_abstract = include_abstract or download_pdfs
+        
+        # Resolve the period once so the search and its metadata always agree
+        years_back_used = None if start_year is not None and end_year is not None else years_back
+        start_year, end_year = self._resolve_range(years_back, start_year, end_year)
         
         # Download PDFs if requested
         pdf_results = None
-        if download_pdfs and results:
-            print(f"\nDownloading PDFs using {pdf_mode} mode...")
+        if download_pdfs:
+            print(f"\nDownloading PDFs using {pdf_mode} mode as papers are found...")
             
             # Set up PDF directory
             if pdf_dir is None:
                 pdf_dir = f"pdfs_{query.replace(' ', '_')[:20]}"
             
-            downloader = PDFDownloader(download_dir=pdf_dir, mode=pdf_mode)
-            pdf_results = downloader.download_papers(results)
+            from pdf_downloader import PDF_DOWNLOAD_WORKERS, PDFDownloader
+            
+            # Finished downloads are appended next to the report as they complete
+            pdf_report_file = None
+            if output_file:
+                pdf_report_file = os.path.splitext(output_file.removesuffix('.gz'))[0] + '_pdf_report.json'
+                if os.path.exists(pdf_report_file + ".ndjson"):
+                    os.remove(pdf_report_file + ".ndjson")
             
+            downloader = PDFDownloader(
+                download_dir=pdf_dir, mode=pdf_mode, max_workers=PDF_DOWNLOAD_WORKERS if pdf_workers is None else pdf_workers
+            )
+            try:
+                results, pdf_results = self._search_while_downloading(
+                    downloader, query, years_back, max_results, output_file, start_year, end_year, journals, source,
+                    include_abstract, pdf_report_file and pdf_report_file + ".ndjson"
+                )
+            finally:
+                downloader.close()
+            if not results:
+                pdf_results = None  # Nothing found, nothing to report
+                if pdf_report_file:
+                    os.remove(pdf_report_file + ".ndjson")
+        else:
+            results = self.search_literature(
+                query, years_back, max_results, output_file, start_year, end_year, journals, source,
+                include_abstract=include_abstract
+            )
+        
+        if pdf_results:
             print(f"\nPDF Download Summary:")
             print(f"  Total attempts: {pdf_results['statistics']['total_attempts']}")
             print(f"  Successful: {pdf_results['statistics']['successful_downloads']}")
@@ -296,25 +1062,16 @@ Return only the enhanced search query (under 80 characters):"""
             
             # Save detailed PDF report
             if output_file:
-                pdf_report_file = output_file.replace('.json', '_pdf_report.json')
                 downloader.save_download_report(pdf_results, pdf_report_file)
+                os.remove(pdf_report_file + ".ndjson")  # Superseded by the full report
                 print(f"  PDF report saved to: {pdf_report_file}")
         
-        # Calculate search period for metadata
-        if start_year is not None and end_year is not None:
-            search_period = f"{start_year}-{end_year}"
-            years_back_used = None
-        else:
-            current_year = datetime.now().year
-            search_period = f"{current_year - years_back}-{current_year}"
-            years_back_used = years_back
-        
         # Add search metadata
         search_info = {
             "search_query": query,
             "years_back": years_back_used,
-            "search_period": search_period,
-            "api_source": "semantic_scholar",
+            "search_period": f"{start_year}-{end_year}",
+            "api_source": "semantic_scholar+openalex" if source == "auto" else source,
             "total_results": len(results),
             "search_date": datetime.now().isoformat(),
             "papers": results
@@ -329,21 +1086,37 @@ Return only the enhanced search query (under 80 characters):"""
                 "statistics": pdf_results["statistics"]
             }
         
-        # Convert to JSON
-        json_output = json.dumps(search_info, indent=2, ensure_ascii=False)
+        # Convert to JSON; the bytes are written as-is, skipping a decode/encode roundtrip
+        json_bytes = dumps_json(search_info, indent=True)
         
         # Save to file if specified
         if output_file:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(json_output)
+            with _open_out(output_file) as f:
+                f.write(json_bytes)
             print(f"Results saved to: {output_file}")
+            
+            # The complete results supersede the incremental saves
+            progress_file = self._progress_file(output_file)
+            if os.path.exists(progress_file):
+                os.remove(progress_file)
         
-        return json_output
+        return json_bytes.decode('utf-8')
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that need a count of at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main():
     """Command line interface for online literature search"""
-    parser = argparse.ArgumentParser(description="Search online peer-reviewed literature using Semantic Scholar")
+    parser = argparse.ArgumentParser(description="Search online peer-reviewed literature using Semantic Scholar and OpenAlex")
     parser.add_argument("query", help="Search query/context")
     parser.add_argument("--years-back", "-y", type=int, default=10, 
                        help="How many years back to search (default: 10, used if no other time option specified)")
@@ -352,9 +1125,13 @@ def main():
     parser.add_argument("--month-range", "-m", type=str, 
                        help="Specific month range like '2025-01-2025-06'")
     parser.add_argument("--max-results", "-n", type=int, default=20, 
-                       help="Maximum results (default: 20, up to 100 without API key)")
+                       help="Maximum results (default: 20, up to 1000 fetched 100 per request)")
     parser.add_argument("--output", "-o", type=str, 
-                       help="Output file (saves JSON results)")
+                       help="Output file (saves JSON results; gzip-compressed if it ends in .gz)")
+    parser.add_argument("--source", "-s", choices=SOURCES, default="semantic_scholar",
+                       help="Literature database: semantic_scholar (default), openalex, or auto (both in parallel, merged)")
+    parser.add_argument("--abstracts", "-a", action="store_true",
+                       help="Include paper abstracts (always included with --download-pdfs)")
     
     # PDF downloading options
     parser.add_argument("--download-pdfs", action="store_true",
@@ -364,6 +1141,8 @@ def main():
                        help="PDF download mode: open_access (free only) or university_access (try all sources)")
     parser.add_argument("--pdf-dir", type=str,
                        help="Directory for PDF downloads (auto-generated if not specified)")
+    parser.add_argument("--pdf-workers", type=_positive_int,
+                       help="Number of PDFs downloaded at the same time (default: 8)")
     
     # Journal filtering options
     parser.add_argument("--journals", "-j", type=str, nargs='+',
@@ -437,7 +1216,10 @@ def main():
             download_pdfs=args.download_pdfs,
             pdf_mode=args.pdf_mode,
             pdf_dir=args.pdf_dir,
-            journals=args.journals
+            journals=args.journals,
+            source=args.source,
+            include_abstract=args.abstracts,
+            pdf_workers=args.pdf_workers
         )
         
         # Print summary if no output file specified
@@ -450,6 +1232,8 @@ def main():
             
     except Exception as e:
         print(f"Error during search: {e}")
+    finally:
+        agent.close()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,126 @@
+import io
 import os
 import re
+import sqlite3
+import threading
 import time
 import requests
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from http.cookiejar import LoadError, LWPCookieJar
+from itertools import batched
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from typing import Callable, Dict, Iterable, List, Optional, Sized, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
-import json
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from json_output import dumps_json
+
+# Papers downloaded concurrently
+PDF_DOWNLOAD_WORKERS = 8
+
+# Minimum seconds between progress bar redraws
+PROGRESS_INTERVAL = 0.5
+
+# Requests per period for each host; workers wait only on hosts they share
+HOST_RATE_LIMITS = {
+    "export.arxiv.org": (1, 3.0),  # arXiv API guideline: one request every 3 seconds
+    "arxiv.org": (4, 1.0),
+    "api.unpaywall.org": (10, 1.0),
+    "eutils.ncbi.nlm.nih.gov": (3, 1.0),  # NCBI E-utilities limit without an API key
+    "www.ncbi.nlm.nih.gov": (3, 1.0),
+}
+DEFAULT_HOST_RATE_LIMIT = (5, 1.0)
+
+# Downloads hit many hosts (arXiv, NCBI, Unpaywall, publishers); keep a
+# connection pool per host so repeat requests skip the TCP/TLS handshake
+POOL_HOSTS = 32
+POOL_CONNECTIONS_PER_HOST = 64
+
+# Titles resolved per arXiv API request (ti:"A" OR ti:"B" OR ...)
+ARXIV_BATCH_SIZE = 20
+ARXIV_BATCH_RESULTS = 100
+# Word-set Jaccard similarity a batch entry needs to be cached for a title; the
+# batch answers many titles at once, so near-namesakes must not cross over
+ARXIV_BATCH_MIN_SIMILARITY = 0.9
+
+# arXiv/Unpaywall/PMC lookup results are cached in the download directory
+LOOKUP_CACHE_FILE = ".lookup_cache.sqlite"
+LOOKUP_CACHE_TTL = 30 * 24 * 60 * 60
+
+# Session cookies (publisher/EZproxy logins) kept between runs; may hold auth tokens
+COOKIE_FILE = ".cookies.lwp"
+
+# PDFs are streamed to disk in chunks rather than held in memory whole
+PDF_CHUNK_SIZE = 64 * 1024
+MAX_PDF_BYTES = 200 * 1024 * 1024
+MIN_PDF_BYTES = 1024  # Anything smaller is an error page or a stub
+
+# Common PDF download link patterns on publisher pages, matched in one tree walk:
+# links mentioning "pdf" in any case (.pdf, /pdf/, fulltextPDF, downloadPDF),
+# links titled "PDF", pdf-download/download-pdf classes, .pdf-link containers
+# and data-testid="pdf-link" elements
+PUBLISHER_PDF_LINKS = etree.XPath(
+    "//a[contains(translate(@href, 'PDF', 'pdf'), 'pdf') or contains(translate(@title, 'PDF', 'pdf'), 'pdf')"
+    " or contains(@class, 'pdf-download') or contains(@class, 'download-pdf')]/@href"
+    " | //*[contains(@class, 'pdf-link')]//a/@href"
+    " | //*[@data-testid='pdf-link']/@href"
+)
+
+# Links ending in .pdf on a landing page that is not itself a PDF
+PAGE_PDF_LINKS = etree.XPath(
+    r"//a/@href[re:test(normalize-space(.), '\.pdf$', 'i')]",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+    smart_strings=False
+)
+
+# arXiv API responses are Atom feeds
+_ATOM_NS = {'a': 'http://www.w3.org/2005/Atom'}
+_ARXIV_ENTRY_TAG = '{http://www.w3.org/2005/Atom}entry'
+_ARXIV_TITLE = etree.XPath('a:title/text()', namespaces=_ATOM_NS, smart_strings=False)
+_ARXIV_ID = etree.XPath('a:id/text()', namespaces=_ATOM_NS, smart_strings=False)
+
+# Patterns used for every paper, compiled once
+_SAFE_FN_STRIP = re.compile(r'[^\w\s-]')
+_SAFE_FN_JOIN = re.compile(r'[-\s]+')
+_TITLE_NORM = re.compile(r'[^\w\s]')
+
+# Papers that already point at an open-access copy need no lookups
+_ARXIV_DOI = re.compile(r'^10\.48550/arxiv\.(.+)$', re.I)
+_ARXIV_URL = re.compile(r'arxiv\.org/abs/')
+_PMC_URL = re.compile(r'(?:pmc\.ncbi\.nlm\.nih\.gov|ncbi\.nlm\.nih\.gov/pmc)/articles/(PMC\d+)', re.I)
+
+
+class _HostRateLimiter:
+    """
+    Thread-safe per-host sliding-window limiter
+    
+    Up to max_calls requests to a host may start at once; later ones wait until
+    the oldest of the last max_calls starts is a full period old, so no window
+    of that length ever holds more than max_calls.
+    """
+    
+    def __init__(self, limits: Dict[str, Tuple[int, float]], default: Tuple[int, float]):
+        self._limits = limits
+        self._default = default
+        self._lock = threading.Lock()
+        self._starts: Dict[str, deque] = {}  # Reserved start times of each host's last max_calls requests
+    
+    def wait(self, url: str):
+        """Block until a request to url's host may be sent"""
+        host = urlparse(url).netloc.lower()
+        max_calls, period = self._limits.get(host, self._default)
+        with self._lock:
+            now = time.monotonic()
+            starts = self._starts.setdefault(host, deque(maxlen=max_calls))
+            start = max(now, starts[0] + period) if len(starts) == max_calls else now
+            starts.append(start)
+        if start > now:
+            time.sleep(start - now)
 
 
 class PDFDownloader:
@@ -15,17 +128,24 @@ class PDFDownloader:
     PDF downloader with support for open access and university-access modes
     """
     
-    def __init__(self, download_dir: str = "downloaded_papers", mode: str = "open_access"):
+    def __init__(
+        self,
+        download_dir: str = "downloaded_papers",
+        mode: str = "open_access",
+        max_workers: int = PDF_DOWNLOAD_WORKERS
+    ):
         """
         Initialize PDF downloader
         
         Args:
             download_dir: Directory to save PDFs
             mode: "open_access" (only free papers) or "university_access" (try all sources)
+            max_workers: Number of papers downloaded concurrently
         """
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         self.mode = mode
+        self.max_workers = max_workers
         self.session = requests.Session()
         
         # Set reasonable headers to avoid blocking
@@ -33,11 +153,37 @@ class PDFDownloader:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': ACCEPT_ENCODING,  # Includes br/zstd when their decoders are installed
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
         
+        # Reuse connections and retry rate limits and transient server errors,
+        # waiting as long as a Retry-After header asks; the last response is
+        # returned rather than raised so failures keep their HTTP status
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_HOSTS,
+            pool_maxsize=max(POOL_CONNECTIONS_PER_HOST, max_workers),
+            max_retries=retry
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Reuse publisher and proxy login cookies from earlier runs
+        self.session.cookies = LWPCookieJar(str(self.download_dir / COOKIE_FILE))
+        try:
+            self.session.cookies.load(ignore_discard=True)
+        except (FileNotFoundError, LoadError):
+            pass  # First run, or an unreadable file that the next save replaces
+        self._rate_limiter = _HostRateLimiter(HOST_RATE_LIMITS, DEFAULT_HOST_RATE_LIMIT)
+        
         # Track download statistics
         self.stats = {
             "total_attempts": 0,
@@ -46,61 +192,197 @@ class PDFDownloader:
             "university_access_used": 0,
             "failed_downloads": 0
         }
+        self._stats_lock = threading.Lock()
+        self._existing_files = set()  # PDF names in download_dir, refreshed per download_papers call
+        
+        # Worker threads share one connection, serialized by the lock
+        self._lookup_cache = sqlite3.connect(
+            self.download_dir / LOOKUP_CACHE_FILE, check_same_thread=False, isolation_level=None
+        )
+        self._lookup_cache.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            "provider TEXT, identifier TEXT, url TEXT, created REAL, PRIMARY KEY (provider, identifier))"
+        )
+        self._lookup_cache_lock = threading.Lock()
+        
+        # The arXiv, Unpaywall and PMC lookups for a paper run side by side;
+        # kept apart from the download pool so workers never wait on themselves
+        self._lookup_executor = ThreadPoolExecutor(max_workers=3 * max_workers)
     
-    def download_papers(self, papers: List[Dict], progress_callback=None) -> Dict:
+    def close(self):
+        """Save the session cookies and close the lookup pool, the lookup cache and the HTTP session"""
+        self._lookup_executor.shutdown()
+        self._lookup_cache.close()
+        self.session.cookies.save(ignore_discard=True)
+        os.chmod(self.session.cookies.filename, 0o600)  # Owner-only: cookies can be login tokens
+        self.session.close()
+    
+    def _count(self, *stats: str):
+        """Increment download statistics; safe to call from worker threads"""
+        with self._stats_lock:
+            for stat in stats:
+                self.stats[stat] += 1
+    
+    def download_papers(
+        self,
+        papers: Iterable[Dict],
+        progress_callback=None,
+        results_file: Optional[str] = None
+    ) -> Dict:
         """
         Download PDFs for a list of papers
         
         Args:
-            papers: List of paper dictionaries from search results
-            progress_callback: Optional callback function for progress updates
+            papers: Paper dictionaries from search results; any iterable works
+            progress_callback: Optional callback function for progress updates, called
+                from worker threads with (completed count, total, download result)
+            results_file: Optional JSON Lines file each result is appended to as it
+                completes, so the results of finished downloads survive a crash
             
         Returns:
-            Dictionary with download results and statistics
+            Dictionary with download results and statistics, results in input order
+            (duplicate papers are skipped)
+        """
+        if isinstance(papers, Sized):
+            papers = list(self._unique_papers(papers))
+            total = len(papers)
+        else:
+            papers = self._unique_papers(papers)
+            total = None
+        return self._download_batches(batched(papers, ARXIV_BATCH_SIZE), total, progress_callback, results_file)
+    
+    def download_paper_batches(
+        self,
+        batches: Iterable[List[Dict]],
+        progress_callback=None,
+        results_file: Optional[str] = None
+    ) -> Dict:
         """
-        results = []
+        Download PDFs for papers that arrive in batches, e.g. the pages of a running search
         
-        with tqdm(total=len(papers), desc="Downloading PDFs") as pbar:
-            for i, paper in enumerate(papers):
-                self.stats["total_attempts"] += 1
-                
-                # Create safe filename from title
-                safe_title = self._create_safe_filename(paper.get("title", "unknown"))
-                year = paper.get("publish_year", "unknown")
-                filename = f"{year}_{safe_title}.pdf"
-                filepath = self.download_dir / filename
-                
-                # Skip if already downloaded
-                if filepath.exists():
-                    results.append({
-                        "paper": paper,
-                        "status": "already_exists",
-                        "filepath": str(filepath),
-                        "source": "local"
-                    })
+        Each batch is started as soon as it arrives instead of waiting for enough
+        papers to fill a lookup batch. Arguments and result are as for download_papers.
+        """
+        seen = set()
+        chunks = (
+            chunk for batch in batches
+            for chunk in batched(self._unique_papers(batch, seen), ARXIV_BATCH_SIZE)
+        )
+        return self._download_batches(chunks, None, progress_callback, results_file)
+    
+    def _download_batches(
+        self,
+        batches: Iterable[Tuple[Dict, ...]],
+        total: Optional[int],
+        progress_callback,
+        results_file: Optional[str]
+    ) -> Dict:
+        """Download deduplicated papers, resolving each batch's lookups together"""
+        # One directory listing instead of a stat() per paper, which is slow on network filesystems
+        self._existing_files = {path.name for path in self.download_dir.iterdir() if path.suffix == '.pdf'}
+        
+        progress_lock = threading.Lock()
+        results_out = open(results_file, 'ab') if results_file else None
+        
+        # Redraws are rate-limited by tqdm, not forced by every completed download
+        with tqdm(total=total, desc="Downloading PDFs", mininterval=PROGRESS_INTERVAL) as pbar:
+            def report(future: Future):
+                if future.exception() is not None:
+                    return  # Re-raised when results are collected below
+                with progress_lock:
+                    if results_out:
+                        results_out.write(dumps_json(future.result()) + b"\n")
                     pbar.update(1)
-                    continue
-                
-                # Try to download
-                download_result = self._download_single_paper(paper, filepath)
-                results.append(download_result)
-                
-                # Update progress
-                if progress_callback:
-                    progress_callback(i + 1, len(papers), download_result)
-                
-                pbar.set_description(f"Downloaded: {self.stats['successful_downloads']}/{self.stats['total_attempts']}")
-                pbar.update(1)
-                
-                # Rate limiting
-                time.sleep(1)
+                    stats = self.get_statistics()
+                    pbar.set_description(
+                        f"Downloaded: {stats['successful_downloads']}/{stats['total_attempts']}", refresh=False
+                    )
+                    if progress_callback:
+                        progress_callback(pbar.n, total, future.result())
+            
+            # Papers are submitted as they arrive, so a still-running search keeps the workers busy;
+            # each batch's arXiv and PMC lookups are resolved together before its papers are submitted
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = []
+                    for batch in batches:
+                        needs_lookup = [
+                            paper for paper in batch
+                            if not self._known_open_access_source(paper.get("url"), paper.get("doi"))
+                        ]
+                        self._prefetch_arxiv([paper.get("title", "") for paper in needs_lookup])
+                        self._prefetch_pmc([paper["doi"] for paper in needs_lookup if paper.get("doi")])
+                        for paper in batch:
+                            future = executor.submit(self._download_paper, paper)
+                            future.add_done_callback(report)
+                            futures.append(future)
+            finally:
+                if results_out:
+                    results_out.close()
+            
+            results = [future.result() for future in futures]
         
         return {
             "results": results,
-            "statistics": self.stats,
+            "statistics": self.get_statistics(),  # Snapshot; later calls keep counting
             "download_directory": str(self.download_dir)
         }
     
+    def _unique_papers(self, papers: Iterable[Dict], seen: Optional[set] = None) -> Iterable[Dict]:
+        """
+        Skip papers whose DOI or target file was already seen
+        
+        Preprint/published pairs and merged search results often repeat a
+        paper; downloading both would waste requests and race on one file.
+        Pass the same seen set to deduplicate across several calls.
+        """
+        if seen is None:
+            seen = set()
+        for paper in papers:
+            keys = {self._paper_filepath(paper).name}
+            if paper.get("doi"):
+                keys.add(paper["doi"].lower())
+            if keys & seen:
+                continue
+            seen |= keys
+            yield paper
+    
+    def _paper_filepath(self, paper: Dict) -> Path:
+        """Where a paper's PDF is saved: <year>_<safe title>.pdf"""
+        # Create safe filename from title
+        safe_title = self._create_safe_filename(paper.get("title", "unknown"))
+        year = paper.get("publish_year", "unknown")
+        return self.download_dir / f"{year}_{safe_title}.pdf"
+    
+    def _download_paper(self, paper: Dict) -> Dict:
+        """Download one paper unless its PDF already exists; runs on a worker thread"""
+        self._count("total_attempts")
+        filepath = self._paper_filepath(paper)
+        
+        # Skip if already downloaded
+        if filepath.name in self._existing_files:
+            return {
+                "paper": paper,
+                "status": "already_exists",
+                "filepath": str(filepath),
+                "source": "local"
+            }
+        
+        download_result = self._download_single_paper(paper, filepath)
+        if download_result["status"] == "downloaded":
+            self._existing_files.add(filepath.name)
+        return download_result
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session once the host's rate limit allows"""
+        self._rate_limiter.wait(url)
+        return self.session.get(url, **kwargs)
+    
+    def _head(self, url: str, **kwargs) -> requests.Response:
+        """HEAD through the shared session once the host's rate limit allows"""
+        self._rate_limiter.wait(url)
+        return self.session.head(url, **kwargs)
+    
     def _download_single_paper(self, paper: Dict, filepath: Path) -> Dict:
         """Download a single paper PDF"""
         
@@ -112,21 +394,31 @@ class PDFDownloader:
         # Try different download strategies
         download_sources = []
         
-        # 1. Check arXiv first (always free)
-        arxiv_url = self._check_arxiv(title)
-        if arxiv_url:
-            download_sources.append(("arxiv", arxiv_url))
-        
-        # 2. Check Unpaywall for open access
-        if doi:
-            unpaywall_url = self._check_unpaywall(doi)
-            if unpaywall_url:
-                download_sources.append(("unpaywall", unpaywall_url))
-        
-        # 3. Try PubMed Central
-        pmc_url = self._check_pubmed_central(title, doi)
-        if pmc_url:
-            download_sources.append(("pmc", pmc_url))
+        known_source = self._known_open_access_source(url, doi)
+        if known_source:
+            # The paper already links to arXiv or PMC, so skip the lookups
+            download_sources.append(known_source)
+        else:
+            # The open-access lookups are independent, so start them together
+            arxiv_lookup = self._lookup_executor.submit(self._check_arxiv, title)
+            unpaywall_lookup = self._lookup_executor.submit(self._check_unpaywall, doi) if doi else None
+            pmc_lookup = self._lookup_executor.submit(self._check_pubmed_central, title, doi)
+            
+            # 1. Check arXiv first (always free)
+            arxiv_url = arxiv_lookup.result()
+            if arxiv_url:
+                download_sources.append(("arxiv", arxiv_url))
+            
+            # 2. Check Unpaywall for open access
+            if unpaywall_lookup:
+                unpaywall_url = unpaywall_lookup.result()
+                if unpaywall_url:
+                    download_sources.append(("unpaywall", unpaywall_url))
+            
+            # 3. Try PubMed Central
+            pmc_url = pmc_lookup.result()
+            if pmc_url:
+                download_sources.append(("pmc", pmc_url))
         
         # 4. If university access mode, try publisher direct
         if self.mode == "university_access":
@@ -144,7 +436,7 @@ class PDFDownloader:
             elif self.mode == "open_access":
                 error_msg += f" (not found in arXiv, PMC, or Unpaywall for '{title[:50]}...')"
             
-            self.stats["failed_downloads"] += 1
+            self._count("failed_downloads")
             return {
                 "paper": paper,
                 "status": "failed",
@@ -162,11 +454,10 @@ class PDFDownloader:
             try:
                 success, error_msg = self._download_from_url(source_url, filepath, source_name)
                 if success:
-                    self.stats["successful_downloads"] += 1
                     if source_name in ["arxiv", "unpaywall", "pmc"]:
-                        self.stats["open_access_found"] += 1
+                        self._count("successful_downloads", "open_access_found")
                     else:
-                        self.stats["university_access_used"] += 1
+                        self._count("successful_downloads", "university_access_used")
                     
                     return {
                         "paper": paper,
@@ -182,7 +473,7 @@ class PDFDownloader:
                 continue
         
         # No successful download
-        self.stats["failed_downloads"] += 1
+        self._count("failed_downloads")
         return {
             "paper": paper,
             "status": "failed",
@@ -193,6 +484,21 @@ class PDFDownloader:
             "failure_reasons": "; ".join(error_details)
         }
     
+    @staticmethod
+    def _known_open_access_source(url: Optional[str], doi: Optional[str]) -> Optional[Tuple[str, str]]:
+        """(source, url) when the paper's URL or DOI already identifies an arXiv or PMC copy"""
+        if doi:
+            match = _ARXIV_DOI.match(doi)
+            if match:
+                return "arxiv", f"https://arxiv.org/abs/{match.group(1)}"
+        if url:
+            if _ARXIV_URL.search(url):
+                return "arxiv", url
+            match = _PMC_URL.search(url)
+            if match:
+                return "pmc", f"https://www.ncbi.nlm.nih.gov/pmc/articles/{match.group(1)}/pdf/"
+        return None
+    
     def _download_from_url(self, url: str, filepath: Path, source: str) -> tuple[bool, str]:
         """Download PDF from URL with different strategies based on source"""
         
@@ -206,34 +512,25 @@ class PDFDownloader:
     def _download_direct_pdf(self, url: str, filepath: Path) -> tuple[bool, str]:
         """Direct PDF download"""
         try:
-            response = self.session.get(url, timeout=30)
-            
-            if response.status_code != 200:
-                return False, f"HTTP {response.status_code}"
-            
-            # Check if it's actually a PDF
-            content_type = response.headers.get('content-type', '')
-            if 'application/pdf' not in content_type and not url.endswith('.pdf'):
-                # Try to find PDF link on page
-                soup = BeautifulSoup(response.content, 'html.parser')
-                pdf_links = soup.find_all('a', href=re.compile(r'\.pdf$', re.I))
-                if pdf_links:
-                    pdf_url = urljoin(url, pdf_links[0]['href'])
-                    response = self.session.get(pdf_url, timeout=30)
-                    if response.status_code != 200:
-                        return False, f"PDF link HTTP {response.status_code}"
-                else:
+            with self._get(url, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    return False, f"HTTP {response.status_code}"
+                
+                # Check if it's actually a PDF
+                content_type = response.headers.get('content-type', '')
+                if 'application/pdf' in content_type or urlparse(url).path.lower().endswith('.pdf'):
+                    return self._stream_to_file(response, filepath)
+                
+                # Try to find PDF link on page; only landing pages get parsed
+                pdf_links = PAGE_PDF_LINKS(html.fromstring(response.content))
+                if not pdf_links:
                     return False, "No PDF content or links found"
+                pdf_url = urljoin(url, pdf_links[0].strip())
             
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            # Verify it's a valid PDF
-            if self._is_valid_pdf(filepath):
-                return True, "Success"
-            else:
-                filepath.unlink()  # Delete invalid file
-                return False, "Downloaded file is not a valid PDF"
+            with self._get(pdf_url, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    return False, f"PDF link HTTP {response.status_code}"
+                return self._stream_to_file(response, filepath)
             
         except requests.exceptions.Timeout:
             return False, "Request timeout"
@@ -251,18 +548,10 @@ class PDFDownloader:
             else:
                 pdf_url = url
             
-            response = self.session.get(pdf_url, timeout=30)
-            if response.status_code != 200:
-                return False, f"arXiv HTTP {response.status_code}"
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            if self._is_valid_pdf(filepath):
-                return True, "Success"
-            else:
-                filepath.unlink()
-                return False, "Downloaded file is not a valid PDF"
+            with self._get(pdf_url, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    return False, f"arXiv HTTP {response.status_code}"
+                return self._stream_to_file(response, filepath)
                 
         except requests.exceptions.Timeout:
             return False, "arXiv request timeout"
@@ -275,53 +564,55 @@ class PDFDownloader:
         """Download from publisher (works with university access)"""
         try:
             # First get the page
-            response = self.session.get(url, timeout=30)
+            response = self._get(url, timeout=30)
             if response.status_code != 200:
                 return False, f"Publisher page HTTP {response.status_code}"
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for PDF download links (common patterns)
-            pdf_selectors = [
-                'a[href*=".pdf"]',
-                'a[href*="pdf"]', 
-                'a.pdf-download',
-                'a.download-pdf',
-                '.pdf-link a',
-                '[data-testid="pdf-link"]'
-            ]
+            # Look for PDF download links (common patterns), resolved once so
+            # anchors pointing at the same PDF are tried only once (fragments
+            # such as #page=2 never reach the server); direct .pdf links are
+            # tried first
+            pdf_urls = dict.fromkeys(
+                urldefrag(urljoin(url, href.strip())).url
+                for href in PUBLISHER_PDF_LINKS(html.fromstring(response.content))
+                if href.strip()
+            )
+            pdf_urls = sorted(pdf_urls, key=lambda pdf_url: '.pdf' not in pdf_url)
             
             pdf_links_found = 0
             last_error = "No PDF links found"
             
-            for selector in pdf_selectors:
-                links = soup.select(selector)
-                for link in links:
-                    href = link.get('href')
-                    if href:
-                        pdf_links_found += 1
-                        pdf_url = urljoin(url, href)
-                        try:
-                            pdf_response = self.session.get(pdf_url, timeout=30)
-                            if pdf_response.status_code == 200:
-                                content_type = pdf_response.headers.get('content-type', '')
-                                if 'application/pdf' in content_type:
-                                    with open(filepath, 'wb') as f:
-                                        f.write(pdf_response.content)
-                                    
-                                    if self._is_valid_pdf(filepath):
-                                        return True, "Success"
-                                    else:
-                                        filepath.unlink()
-                                        last_error = "PDF file was invalid"
-                                else:
-                                    last_error = f"Link not PDF content-type: {content_type}"
+            for pdf_url in pdf_urls:
+                pdf_links_found += 1
+                try:
+                    # Probe with HEAD so HTML pages behind "PDF" links are
+                    # skipped without transferring their body; servers that
+                    # refuse HEAD (405/403) are probed by the streamed GET below
+                    head = self._head(pdf_url, allow_redirects=True, timeout=10)
+                    if head.status_code == 200:
+                        content_type = head.headers.get('content-type', '')
+                        if 'application/pdf' not in content_type:
+                            last_error = f"Link not PDF content-type: {content_type}"
+                            continue
+                    elif head.status_code not in (403, 405):
+                        last_error = f"PDF link HTTP {head.status_code}"
+                        continue
+                    
+                    with self._get(pdf_url, stream=True, timeout=30) as pdf_response:
+                        if pdf_response.status_code == 200:
+                            content_type = pdf_response.headers.get('content-type', '')
+                            if 'application/pdf' in content_type:
+                                success, last_error = self._stream_to_file(pdf_response, filepath)
+                                if success:
+                                    return True, "Success"
                             else:
-                                last_error = f"PDF link HTTP {pdf_response.status_code}"
-                        except requests.exceptions.Timeout:
-                            last_error = "PDF link timeout"
-                        except Exception as e:
-                            last_error = f"PDF link error: {str(e)}"
+                                last_error = f"Link not PDF content-type: {content_type}"
+                        else:
+                            last_error = f"PDF link HTTP {pdf_response.status_code}"
+                except requests.exceptions.Timeout:
+                    last_error = "PDF link timeout"
+                except Exception as e:
+                    last_error = f"PDF link error: {str(e)}"
             
             if pdf_links_found == 0:
                 return False, "No PDF download links found on publisher page"
@@ -335,113 +626,278 @@ class PDFDownloader:
         except Exception as e:
             return False, f"Publisher error: {str(e)}"
     
-    def _check_arxiv(self, title: str) -> Optional[str]:
-        """Check if paper is available on arXiv"""
+    def _cached_lookup(self, provider: str, identifier: str, lookup: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Return the cached PDF URL (or None for "not found") of a provider lookup,
+        running lookup() on a miss
+        
+        Failed lookups raise and are not cached, so the next run tries again.
+        """
+        row = self._get_cached_lookup(provider, identifier)
+        if row is not None:
+            return row[0]
+        
         try:
-            # Search arXiv API
-            search_url = "http://export.arxiv.org/api/query"
-            params = {
-                'search_query': f'ti:"{title}"',
-                'start': 0,
-                'max_results': 5
-            }
-            
-            response = self.session.get(search_url, params=params, timeout=10)
-            if response.status_code == 200:
-                # Parse XML response
-                from xml.etree import ElementTree as ET
-                root = ET.fromstring(response.content)
-                
-                for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
-                    entry_title = entry.find('{http://www.w3.org/2005/Atom}title')
-                    if entry_title is not None and self._titles_similar(title, entry_title.text):
-                        id_elem = entry.find('{http://www.w3.org/2005/Atom}id')
-                        if id_elem is not None:
-                            return id_elem.text.replace('/abs/', '/pdf/') + '.pdf'
+            url = lookup()
         except Exception:
-            pass
+            return None
         
+        self._put_cached_lookup(provider, identifier, url)
+        return url
+    
+    def _get_cached_lookup(self, provider: str, identifier: str) -> Optional[Tuple[Optional[str]]]:
+        """Return (url,) for a fresh cached lookup, or None on a miss"""
+        with self._lookup_cache_lock:
+            row = self._lookup_cache.execute(
+                "SELECT url, created FROM lookups WHERE provider = ? AND identifier = ?", (provider, identifier)
+            ).fetchone()
+        if row is not None and time.time() - row[1] < LOOKUP_CACHE_TTL:
+            return (row[0],)
         return None
     
+    def _put_cached_lookup(self, provider: str, identifier: str, url: Optional[str]):
+        """Store a lookup result (url is None when the provider has no PDF)"""
+        with self._lookup_cache_lock:
+            self._lookup_cache.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?)", (provider, identifier, url, time.time())
+            )
+    
+    def _check_arxiv(self, title: str) -> Optional[str]:
+        """Check if paper is available on arXiv"""
+        return self._cached_lookup("arxiv", self._title_key(title), lambda: self._query_arxiv(title))
+    
     def _check_unpaywall(self, doi: str) -> Optional[str]:
         """Check Unpaywall API for open access version"""
+        return self._cached_lookup("unpaywall", doi.lower(), lambda: self._query_unpaywall(doi))
+    
+    def _check_pubmed_central(self, title: str, doi: str = None) -> Optional[str]:
+        """
+        Check PubMed Central for free full text
+        
+        A DOI is resolved exactly through the PMC ID converter; the looser
+        title search is only used for papers without one.
+        """
+        if doi:
+            return self._cached_lookup("pmc_doi", doi.lower(), lambda: self._query_pmc_ids([doi]).get(doi.lower()))
+        return self._cached_lookup("pmc", self._title_key(title), lambda: self._query_pubmed_central(title))
+    
+    def _prefetch_arxiv(self, titles: List[str]):
+        """
+        Resolve uncached titles with a single arXiv query and cache the results
+        
+        Titles left unresolved fall through to one query each in _check_arxiv.
+        """
+        titles = [
+            title for title in dict.fromkeys(titles)
+            if title.strip() and self._get_cached_lookup("arxiv", self._title_key(title)) is None
+        ]
+        if len(titles) < 2:
+            return  # Nothing to gain over the single-title query
+        
+        phrases = (title.replace('"', '') for title in titles)
         try:
-            url = f"https://api.unpaywall.org/v2/{doi}?email=researcher@university.edu"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('is_oa', False):
-                    best_location = data.get('best_oa_location', {})
-                    pdf_url = best_location.get('url_for_pdf')
-                    if pdf_url:
-                        return pdf_url
+            entries = self._query_arxiv_entries(
+                " OR ".join(f'ti:"{phrase}"' for phrase in phrases), ARXIV_BATCH_RESULTS
+            )
         except Exception:
-            pass
+            return
         
-        return None
+        # A truncated result page may be missing matches, so only a complete one proves absence
+        complete = len(entries) < ARXIV_BATCH_RESULTS
+        entries = [(self._title_words(entry_title), url) for entry_title, url in entries]
+        for title in titles:
+            words = self._title_words(title)
+            similarity, pdf_url = max(
+                ((self._title_jaccard(words, entry_words), url) for entry_words, url in entries),
+                default=(0.0, None)
+            )
+            if similarity >= ARXIV_BATCH_MIN_SIMILARITY:
+                self._put_cached_lookup("arxiv", self._title_key(title), pdf_url)
+            elif complete and not any(self._titles_similar(words, entry_words) for entry_words, _ in entries):
+                # Not even a loose match, so the single-title query would find nothing either
+                self._put_cached_lookup("arxiv", self._title_key(title), None)
     
-    def _check_pubmed_central(self, title: str, doi: str = None) -> Optional[str]:
-        """Check PubMed Central for free full text"""
+    def _prefetch_pmc(self, dois: List[str]):
+        """Resolve uncached DOIs with a single PMC ID converter request and cache the results"""
+        dois = [
+            doi for doi in dict.fromkeys(doi.lower() for doi in dois)
+            if self._get_cached_lookup("pmc_doi", doi) is None
+        ]
+        if len(dois) < 2:
+            return  # Nothing to gain over the single-DOI request
+        
         try:
-            # Search PMC API
-            search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-            params = {
-                'db': 'pmc',
-                'term': title,
-                'retmode': 'json',
-                'retmax': 5
-            }
-            
-            response = self.session.get(search_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                id_list = data.get('esearchresult', {}).get('idlist', [])
-                
-                if id_list:
-                    # Get details for first result
-                    pmc_id = id_list[0]
-                    return f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmc_id}/pdf/"
+            pmc_urls = self._query_pmc_ids(dois)
         except Exception:
-            pass
+            return
+        
+        # The converter answers for every DOI it was sent, so a missing PMCID proves absence
+        for doi in dois:
+            self._put_cached_lookup("pmc_doi", doi, pmc_urls.get(doi))
+    
+    def _query_arxiv(self, title: str) -> Optional[str]:
+        """Search the arXiv API for the paper's PDF URL"""
+        words = self._title_words(title)
+        for entry_title, pdf_url in self._query_arxiv_entries(f'ti:"{title}"', 5):
+            if self._titles_similar(words, self._title_words(entry_title)):
+                return pdf_url
         
         return None
     
-    def _is_valid_pdf(self, filepath: Path) -> bool:
-        """Check if downloaded file is a valid PDF"""
-        try:
-            if filepath.stat().st_size < 1024:  # Too small
-                return False
-            
-            with open(filepath, 'rb') as f:
-                header = f.read(4)
-                return header == b'%PDF'
-        except Exception:
-            return False
+    def _query_arxiv_entries(self, search_query: str, max_results: int) -> List[Tuple[str, str]]:
+        """Run an arXiv API search, returning (title, PDF URL) of each entry"""
+        search_url = "http://export.arxiv.org/api/query"
+        params = {
+            'search_query': search_query,
+            'start': 0,
+            'max_results': max_results
+        }
+        
+        response = self._get(search_url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        # Stream the feed entry by entry, freeing each one (abstract, authors,
+        # links) once its title and id are read, so big batch responses never
+        # sit in memory as a full tree
+        entries = []
+        for _, entry in etree.iterparse(io.BytesIO(response.content), tag=_ARXIV_ENTRY_TAG):
+            entry_title = _ARXIV_TITLE(entry)
+            entry_id = _ARXIV_ID(entry)
+            if entry_title and entry_id:
+                entries.append((entry_title[0], entry_id[0].replace('/abs/', '/pdf/') + '.pdf'))
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+        
+        return entries
+    
+    def _query_unpaywall(self, doi: str) -> Optional[str]:
+        """Ask Unpaywall for an open access PDF URL"""
+        url = f"https://api.unpaywall.org/v2/{doi}?email=researcher@university.edu"
+        response = self._get(url, timeout=10)
+        if response.status_code == 404:
+            return None  # DOI unknown to Unpaywall
+        response.raise_for_status()
+        
+        data = response.json()
+        if data.get('is_oa', False):
+            best_location = data.get('best_oa_location') or {}
+            return best_location.get('url_for_pdf') or None
+        
+        return None
+    
+    def _query_pubmed_central(self, title: str) -> Optional[str]:
+        """Search PubMed Central for free full text"""
+        search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+        params = {
+            'db': 'pmc',
+            'term': title,
+            'retmode': 'json',
+            'retmax': 5
+        }
+        
+        response = self._get(search_url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        id_list = response.json().get('esearchresult', {}).get('idlist', [])
+        if id_list:
+            # Get details for first result
+            pmc_id = id_list[0]
+            return f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmc_id}/pdf/"
+        
+        return None
+    
+    def _query_pmc_ids(self, dois: List[str]) -> Dict[str, Optional[str]]:
+        """Map lower-cased DOIs to their PMC PDF URL (None when not in PMC) via the PMC ID converter"""
+        idconv_url = "https://www.ncbi.nlm.nih.gov/pmc/utils/idconv/v1.0/"
+        params = {
+            'ids': ",".join(dois),
+            'idtype': 'doi',
+            'format': 'json'
+        }
+        
+        response = self._get(idconv_url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        pmc_urls = {}
+        for record in response.json().get('records', []):
+            doi = (record.get('requested-id') or record.get('doi') or '').lower()
+            pmcid = record.get('pmcid')
+            pmc_urls[doi] = f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/pdf/" if pmcid else None
+        
+        return pmc_urls
     
-    def _titles_similar(self, title1: str, title2: str) -> bool:
-        """Check if two titles are similar (simple comparison)"""
-        # Normalize titles
-        t1 = re.sub(r'[^\w\s]', '', title1.lower()).strip()
-        t2 = re.sub(r'[^\w\s]', '', title2.lower()).strip()
+    def _stream_to_file(self, response: requests.Response, filepath: Path) -> tuple[bool, str]:
+        """
+        Write a streamed response to filepath in chunks and check the result is a PDF
         
-        # Simple similarity check
-        words1 = set(t1.split())
-        words2 = set(t2.split())
+        Memory use stays at one chunk regardless of the PDF size. The %PDF
+        magic is checked on the first chunk, before the file is created, so
+        non-PDF responses are never written. Too-small or partial files are
+        deleted.
+        """
+        content_type = response.headers.get('content-type', '')
+        if 'html' in content_type:
+            return False, f"Response is not a PDF (content-type: {content_type})"
+        content_length = response.headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) > MAX_PDF_BYTES:
+            return False, f"PDF too large ({int(content_length) // (1024 * 1024)} MB)"
         
+        chunks = response.iter_content(chunk_size=PDF_CHUNK_SIZE)
+        first_chunk = next((chunk for chunk in chunks if chunk), b'')
+        if not first_chunk.startswith(b'%PDF'):
+            return False, "Downloaded file is not a valid PDF"
+        
+        written = len(first_chunk)
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(first_chunk)
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+        except BaseException:
+            filepath.unlink(missing_ok=True)  # Don't leave a partial PDF behind
+            raise
+        
+        if written < MIN_PDF_BYTES:
+            filepath.unlink()  # Delete invalid file
+            return False, "Downloaded file is not a valid PDF"
+        return True, "Success"
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _title_key(title: str) -> str:
+        """Lookup cache key of a title: case, punctuation and spacing differences share an entry"""
+        return " ".join(_TITLE_NORM.sub('', title.lower()).split())
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _title_words(title: str) -> frozenset:
+        """Normalized word set of a title, computed once per distinct title"""
+        return frozenset(PDFDownloader._title_key(title).split())
+    
+    @staticmethod
+    def _title_jaccard(words1: frozenset, words2: frozenset) -> float:
+        """Symmetric similarity of two _title_words sets (shared words / all words)"""
+        if not words1 or not words2:
+            return 0.0
+        return len(words1 & words2) / len(words1 | words2)
+    
+    def _titles_similar(self, words1: frozenset, words2: frozenset) -> bool:
+        """Check if two titles, given as _title_words sets, are similar (simple comparison)"""
         if len(words1) == 0 or len(words2) == 0:
             return False
         
-        intersection = words1.intersection(words2)
-        similarity = len(intersection) / min(len(words1), len(words2))
-        
+        similarity = len(words1 & words2) / min(len(words1), len(words2))
         return similarity > 0.6
     
-    def _create_safe_filename(self, title: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _create_safe_filename(title: str) -> str:
         """Create filesystem-safe filename from title"""
         # Remove/replace problematic characters
-        safe = re.sub(r'[^\w\s-]', '', title)
-        safe = re.sub(r'[-\s]+', '_', safe)
+        safe = _SAFE_FN_STRIP.sub('', title)
+        safe = _SAFE_FN_JOIN.sub('_', safe)
         
         # Limit length
         if len(safe) > 100:
@@ -451,7 +907,8 @@ class PDFDownloader:
     
     def get_statistics(self) -> Dict:
         """Get download statistics"""
-        return self.stats.copy()
+        with self._stats_lock:
+            return self.stats.copy()
     
     def save_download_report(self, results: Dict, output_file: str):
         """Save detailed download report"""
@@ -462,5 +919,5 @@ class PDFDownloader:
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        with open(output_file, 'wb') as f:
+            f.write(dumps_json(report, indent=True))
\ No newline at end of file